@@ -1,24 +1,91 @@
-import shutil
 import zipfile
+import tarfile
+import zlib
+import heapq
+import shutil
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from fnmatch import fnmatch
-from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 from colorama import init, Fore
 import hashlib
+import mmap
 import time
 import argparse
 import os
-import stat
+import re
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for `--compressor zstd`
+    zstandard = None
+
+try:
+    from blake3 import blake3
+except ImportError:  # Optional dependency, only needed for `--checksum blake3`
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # Optional dependency, only needed for `--checksum xxh3`
+    xxhash = None
 
 # Initialize colorama for colored logging output
 init(autoreset=True)
 
-# Global counters for reporting
-files_copied = 0
-files_ignored = 0
+# Compression methods available for the archive and the file extension each one produces
+ZIP_COMPRESSION = {
+    'deflate': zipfile.ZIP_DEFLATED,
+    'store': zipfile.ZIP_STORED,
+}
+ARCHIVE_EXTENSIONS = {
+    'deflate': '.zip',
+    'store': '.zip',
+    'zstd': '.tar.zst',
+}
+ZSTD_DEFAULT_LEVEL = 3
+
+# Files up to this size are DEFLATE-compressed in worker processes; larger ones are
+# streamed through `zipfile` in the main process to keep memory bounded
+PARALLEL_MAX_FILE_SIZE = 8 << 20  # 8 MiB
+# Small files are sent to the pool in batches, so each task amortizes the IPC round trip;
+# a batch is submitted once it holds this many files or this many bytes
+PARALLEL_BATCH_FILES = 64
+PARALLEL_BATCH_SIZE = 4 << 20  # 4 MiB
+# Number of in-flight compression batches per worker
+PARALLEL_QUEUE_FACTOR = 2
+# Number of pool-eligible files buffered to hand the largest ones to the pool first
+PARALLEL_LOOKAHEAD = 256
+
+# Extensions of formats that are already compressed; these are stored in the ZIP as-is
+# instead of spending CPU on a DEFLATE pass that would not make them any smaller
+STORED_EXTENSIONS = frozenset({
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.lz4', '.7z', '.rar',
+    '.jar', '.whl', '.apk', '.docx', '.xlsx', '.pptx',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.avif',
+    '.mp3', '.aac', '.m4a', '.ogg', '.opus', '.flac',
+    '.mp4', '.m4v', '.mkv', '.mov', '.avi', '.webm',
+    '.woff', '.woff2',
+})
+
+# Buffer size used to feed file contents into the compressor (zipfile and tarfile default to 8-16 KiB)
+COPY_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Checksum algorithms available for the archive and their display names
+CHECKSUM_NAMES = {
+    'sha256': 'SHA-256',
+    'blake3': 'BLAKE3',
+    'xxh3': 'XXH3-128',
+}
+
+# Files larger than this are hashed in chunks instead of through a memory map on Windows
+MMAP_MAX_SIZE_WINDOWS = 2 << 30  # 2 GiB
+
+# Chunk size used when hashing files without `hashlib.file_digest`
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
 
 class ColoredFormatter(logging.Formatter):
     """
@@ -32,9 +99,35 @@ class ColoredFormatter(logging.Formatter):
     }
     
     def format(self, record):
+        # Color the formatted line without mutating `record.msg`, so other handlers see the original message
         color = self.COLORS.get(record.levelname, Fore.WHITE)
-        record.msg = f"{color}{record.msg}{Fore.RESET}"
-        return super().format(record)
+        return f"{color}{super().format(record)}{Fore.RESET}"
+
+class HashingWriter:
+    """
+    File-like wrapper that computes the checksum of everything written through it.
+    It deliberately does not expose `seek`, so `zipfile` streams the archive sequentially
+    and the hash matches the bytes that end up on disk.
+    """
+    def __init__(self, raw, algorithm='sha256'):
+        self._raw = raw
+        self._h = new_hasher(algorithm)
+
+    def write(self, data):
+        self._h.update(data)
+        return self._raw.write(data)
+
+    def flush(self):
+        self._raw.flush()
+
+    def tell(self):
+        return self._raw.tell()
+
+    def close(self):
+        self._raw.close()
+
+    def hexdigest(self):
+        return self._h.hexdigest()
 
 def setup_logger():
     """
@@ -46,11 +139,106 @@ def setup_logger():
     
     logging.basicConfig(level=logging.DEBUG, handlers=[handler])
 
-def load_gitignore_patterns(gitignore_path, base_dir):
+def bracket_to_regex(pattern, i):
+    """
+    Translates the bracket expression that starts right after the `[` at `pattern[i - 1]`,
+    following `fnmatch.translate`: a `]` right after `[` or `[!` is a literal, reversed ranges
+    such as `z-a` are dropped, and an unclosed `[` matches itself.
+    Returns the regex and the index just past the expression.
+    """
+    n = len(pattern)
+    j = i
+    if j < n and pattern[j] == '!':
+        j += 1
+    if j < n and pattern[j] == ']':
+        j += 1
+    while j < n and pattern[j] != ']':
+        j += 1
+    if j >= n:
+        return '\\[', i
+
+    start = i + 1 if pattern[i] == '!' else i
+    chunks = []
+    k = start + 1
+    while True:
+        k = pattern.find('-', k, j)
+        if k < 0:
+            break
+        chunks.append(pattern[start:k])
+        start = k + 1
+        k = k + 3
+    chunk = pattern[start:j]
+    if chunk:
+        chunks.append(chunk)
+    elif chunks:
+        chunks[-1] += '-'
+    # Drop empty ranges, which are invalid in a regex
+    for k in range(len(chunks) - 1, 0, -1):
+        if chunks[k - 1] and chunks[k] and chunks[k - 1][-1] > chunks[k][0]:
+            chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+            del chunks[k]
+    chars = '-'.join(c.replace('\\', '\\\\').replace('-', '\\-').replace('[', '\\[').replace(']', '\\]')
+                     for c in chunks)
+    chars = re.sub(r'([&~|])', r'\\\1', chars)
+
+    if not chars:
+        # Every range was dropped: an empty set never matches, its negation matches any character
+        regex = '[^/]' if pattern[i] == '!' else '(?!)'
+    elif pattern[i] == '!':
+        regex = f'[^/{chars}]'
+    elif chars[0] == '^':
+        regex = f'[\\{chars}]'
+    else:
+        regex = f'[{chars}]'
+    return regex, j + 1
+
+def glob_to_regex(pattern):
     """
-    Reads the `.gitignore` file and processes its patterns correctly.
+    Translates a `.gitignore` glob into a regex. Unlike `fnmatch.translate`, `*` and `?` do not
+    match `/`, and `**` matches across directories (`**/` matches zero or more of them).
     """
-    patterns = []
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            regex, i = bracket_to_regex(pattern, i + 1)
+            parts.append(regex)
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts)
+
+def compile_patterns(patterns):
+    """
+    Combines a list of `.gitignore` globs into a single compiled regex, or None if the list is empty.
+    Matching is case-insensitive on Windows, like the filesystem.
+    """
+    if not patterns:
+        return None
+    flags = re.IGNORECASE if os.name == 'nt' else 0
+    return re.compile('(?s:' + '|'.join(glob_to_regex(pattern) for pattern in patterns) + r')\Z', flags)
+
+def load_gitignore_patterns(gitignore_path):
+    """
+    Reads the `.gitignore` file and compiles its patterns into a `(name_regex, path_regex)` pair.
+    Patterns without a slash (or with only a leading `**/`) match a file or directory name at any
+    depth; other patterns containing a slash are anchored to the source directory and match the
+    relative path.
+    """
+    name_patterns = []
+    path_patterns = []
     if gitignore_path.exists():
         with gitignore_path.open('r', encoding='utf-8') as file:
             for line in file:
@@ -58,84 +246,346 @@ def load_gitignore_patterns(gitignore_path, base_dir):
                 if not line or line.startswith('#'):
                     continue
 
-                pattern = base_dir / line
-                if line.endswith('/'):
-                    patterns.append(pattern)
+                line = line.rstrip('/')
+                name = line
+                while name.startswith('**/'):
+                    name = name[3:]
+                if '/' not in name:
+                    if name:
+                        name_patterns.append(name)
                 else:
-                    patterns.append(pattern)
-                    if not any(c in line for c in ['*', '?', '[']) and not '.' in line.split('/')[-1]:
-                        patterns.append(pattern.with_name(pattern.name + '/'))
-    return patterns
+                    path_patterns.append(line.lstrip('/'))
+    return compile_patterns(name_patterns), compile_patterns(path_patterns)
+
+def should_ignore(rel_path, patterns):
+    """
+    Determines if a path, given as a string relative to the source directory, should be ignored
+    based on the `.gitignore` patterns.
+    """
+    name_regex, path_regex = patterns
+    if name_regex is not None and name_regex.match(os.path.basename(rel_path)):
+        return True
+    if path_regex is not None:
+        if os.sep != '/':
+            rel_path = rel_path.replace(os.sep, '/')
+        return path_regex.match(rel_path) is not None
+    return False
 
-def should_ignore(file_path, patterns, base_dir):
+@contextmanager
+def open_archive(fileobj, compressor='deflate', level=None):
     """
-    Determines if a file should be ignored based on the `.gitignore` patterns.
+    Opens the output archive on top of `fileobj` using the selected compressor.
+    `deflate` and `store` produce a ZIP file, `zstd` produces a multi-threaded `.tar.zst` stream.
     """
-    abs_path = file_path.resolve()
-    rel_path = abs_path.relative_to(base_dir)
+    if compressor == 'zstd':
+        cctx = zstandard.ZstdCompressor(level=ZSTD_DEFAULT_LEVEL if level is None else level, threads=-1)
+        with cctx.stream_writer(fileobj, closefd=False) as stream:
+            with tarfile.open(mode='w|', fileobj=stream, bufsize=COPY_BUFFER_SIZE,
+                              copybufsize=COPY_BUFFER_SIZE) as tar:
+                yield tar
+    else:
+        with zipfile.ZipFile(fileobj, 'w', ZIP_COMPRESSION[compressor], compresslevel=level) as zipf:
+            yield zipf
 
-    for pattern in patterns:
+def walk_scandir(src, patterns):
+    """
+    Walks the source directory with `os.scandir`, using an explicit stack instead of recursion.
+    Yields `(entry, rel_path)` for every file, where `rel_path` is relative to `src`.
+    `.git` and ignored directories are pruned without being entered; symlinked directories
+    are not followed, like `os.walk`.
+    """
+    stack = ['']
+    while stack:
+        rel_dir = stack.pop()
         try:
-            if fnmatch(str(rel_path), str(pattern)) or fnmatch(file_path.name, pattern.name):
-                return True
-        except Exception as e:
-            logging.error(f"Error comparing {rel_path} with pattern {pattern}: {e}")
-    return False
+            with os.scandir(os.path.join(src, rel_dir)) as entries:
+                for entry in entries:
+                    rel_path = os.path.join(rel_dir, entry.name)
+                    if entry.is_dir(follow_symlinks=False):
+                        # Skip copying files and directories inside `.git`
+                        if entry.name != '.git' and not should_ignore(rel_path, patterns):
+                            stack.append(rel_path)
+                    elif entry.is_file():
+                        yield entry, rel_path
+        except OSError as e:
+            logging.error(f"Cannot read directory {rel_dir or src}: {e}")
+
+def is_precompressed(arcname):
+    """
+    Returns True if the file extension belongs to an already-compressed format (see `STORED_EXTENSIONS`).
+    """
+    return os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS
 
-def copy_file(src_file, temp_dir, base_dir):
+def compress_file(src_file, level=None):
     """
-    Copies a file from the source directory to a temporary backup directory.
+    Reads and DEFLATE-compresses a whole file. Runs in a worker process.
+    Returns the raw deflate stream together with the CRC-32 and size of the uncompressed data.
     """
-    global files_copied
-    rel_path = src_file.relative_to(base_dir)
-    dest_file = temp_dir / rel_path
-    dest_file.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src_file, dest_file)
-    files_copied += 1
-    logging.info(f'File copied: {src_file}')
+    with open(src_file, 'rb') as f:
+        data = f.read()
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    return compressed, zlib.crc32(data), len(data)
 
-def calculate_sha256(file):
+def compress_batch(batch, level=None):
     """
-    Calculates the SHA-256 hash of a file for integrity verification.
+    Compresses a list of files with `compress_file` in a single worker task.
     """
-    sha256_hash = hashlib.sha256()
-    with open(file, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+    return [compress_file(src_file, level) for src_file in batch]
 
-def verify_integrity(zip_path, original_hash):
+def compress_in_workers(files, level=None, workers=1):
     """
-    Verifies the integrity of the ZIP file by comparing its calculated SHA-256 hash
-    with the original hash stored during the backup process.
+    Compresses the `(src_file, arcname)` pairs in `files` with a pool of `workers` processes, yielding
+    `(src_file, arcname, result)` for every file, though not in the order of `files` (see below).
+    `result` is the output of `compress_file`, or None for files that are left to the main process:
+    empty or already-compressed files, which are stored, and files too large to be compressed in a
+    worker. Those are interleaved with the pool results while batches are in flight, so the main
+    process works on them in parallel with the workers.
+    Pool files are handed out largest first within a sliding window of `PARALLEL_LOOKAHEAD` files,
+    which approximates longest-processing-time-first scheduling without materializing the file list.
+    Small files are grouped into batches, and only a bounded number of batches is kept in flight,
+    so memory use does not grow with the tree.
     """
-    calculated_hash = calculate_sha256(zip_path)
-    if calculated_hash == original_hash:
-        logging.info("✅ The ZIP file is valid and has not been modified.")
+    max_pending = workers * PARALLEL_QUEUE_FACTOR
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        heap = []
+        batch = []
+        batch_size = 0
+        pending = deque()
+        serial = deque()
+
+        def submit_batch():
+            nonlocal batch, batch_size
+            if batch:
+                pending.append((batch, executor.submit(compress_batch, [f for f, _ in batch], level)))
+            batch = []
+            batch_size = 0
+
+        def add_largest_to_batch():
+            nonlocal batch_size
+            neg_size, _, src_file, arcname = heapq.heappop(heap)
+            batch.append((src_file, arcname))
+            batch_size -= neg_size
+            if len(batch) >= PARALLEL_BATCH_FILES or batch_size >= PARALLEL_BATCH_SIZE:
+                submit_batch()
+
+        def next_results():
+            # Compress one serial file while the pool works, then collect the oldest batch
+            if serial:
+                src_file, arcname = serial.popleft()
+                yield src_file, arcname, None
+            if pending:
+                yield from batch_results(*pending.popleft())
+
+        for index, (src_file, arcname) in enumerate(files):
+            # Only files that may go to the pool need their size
+            size = 0 if is_precompressed(arcname) else os.path.getsize(src_file)
+            if 0 < size <= PARALLEL_MAX_FILE_SIZE:
+                heapq.heappush(heap, (-size, index, src_file, arcname))
+                if len(heap) > PARALLEL_LOOKAHEAD:
+                    add_largest_to_batch()
+            else:
+                serial.append((src_file, arcname))
+            while len(pending) >= max_pending or len(serial) >= max_pending:
+                yield from next_results()
+
+        while heap:
+            add_largest_to_batch()
+        submit_batch()
+        while pending or serial:
+            yield from next_results()
+
+def batch_results(batch, future):
+    """
+    Pairs the `(src_file, arcname)` entries of a batch with their `compress_file` results,
+    or with None when the batch was not sent to the pool.
+    """
+    results = future.result() if future is not None else [None] * len(batch)
+    for (src_file, arcname), result in zip(batch, results):
+        yield src_file, arcname, result
+
+def append_entry(zipf, zinfo, chunks):
+    """
+    Appends an entry whose CRC and sizes are already set on `zinfo` to the ZIP archive, writing the
+    local header and the `chunks` of entry data directly and registering the entry for the central
+    directory. Since the sizes are known up front, no data descriptor (flag 0x08) is needed, which
+    streaming readers require for stored entries.
+    `zipfile` has no public API for this, so it relies on the `fp`, `filelist`, `NameToInfo` and
+    `start_dir` attributes of `ZipFile`.
+    """
+    zinfo.header_offset = zipf.fp.tell()
+    zipf.fp.write(zinfo.FileHeader())
+    for chunk in chunks:
+        zipf.fp.write(chunk)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+def write_precompressed(zipf, src_file, arcname, compressed, crc, size):
+    """
+    Appends an entry whose deflate stream was produced by `compress_file` to the ZIP archive.
+    """
+    zinfo = zipfile.ZipInfo.from_file(src_file, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.file_size = size
+    zinfo.compress_size = len(compressed)
+    append_entry(zipf, zinfo, [compressed])
+
+def write_stored(zipf, src_file, arcname):
+    """
+    Appends a file to the ZIP archive without compression. The CRC is computed in a first pass
+    over the file, so the header can carry the final CRC and sizes.
+    """
+    zinfo = zipfile.ZipInfo.from_file(src_file, arcname)
+    zinfo.compress_type = zipfile.ZIP_STORED
+
+    crc = 0
+    size = 0
+    if zinfo.file_size:
+        buffer = bytearray(COPY_BUFFER_SIZE)
+        view = memoryview(buffer)
+        with open(src_file, 'rb') as f:
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                crc = zlib.crc32(view[:read], crc)
+                size += read
+    zinfo.CRC = crc
+    zinfo.file_size = zinfo.compress_size = size
+
+    def read_chunks():
+        if not size:
+            return
+        remaining = size
+        with open(src_file, 'rb') as f:
+            while remaining:
+                chunk = f.read(min(COPY_BUFFER_SIZE, remaining))
+                if not chunk:
+                    raise OSError(f"{src_file} changed while it was being archived")
+                remaining -= len(chunk)
+                yield chunk
+
+    append_entry(zipf, zinfo, read_chunks())
+
+def write_buffered(zipf, src_file, arcname):
+    """
+    Writes a file into the ZIP archive like `ZipFile.write`, but feeds the compressor
+    `COPY_BUFFER_SIZE` bytes at a time instead of zipfile's 8 KiB.
+    Empty and already-compressed files, and every file of a `store` archive, go through
+    `write_stored` instead.
+    """
+    zinfo = zipfile.ZipInfo.from_file(src_file, arcname)
+    if zipf.compression == zipfile.ZIP_STORED or zinfo.file_size == 0 or is_precompressed(arcname):
+        write_stored(zipf, src_file, arcname)
+        return
+    zinfo.compress_type = zipf.compression
+    zinfo._compresslevel = zipf.compresslevel
+    with open(src_file, 'rb') as src, zipf.open(zinfo, 'w') as dest:
+        shutil.copyfileobj(src, dest, COPY_BUFFER_SIZE)
+
+def iter_files(src, patterns, stats, exclude=None):
+    """
+    Lazily yields `(path, rel_path)` for every file of the source directory that is not ignored,
+    so enumeration is pipelined with compression instead of materializing the whole file list.
+    Ignored files are counted in `stats['ignored']`.
+    `exclude` is an absolute path to skip, e.g. the archive being written when `dest` is inside `src`.
+    """
+    for entry, rel_path in walk_scandir(src, patterns):
+        if entry.path == exclude:
+            continue
+        if should_ignore(rel_path, patterns):
+            logging.warning('Ignored: %s', entry.path)
+            stats['ignored'] += 1
+            continue
+        yield entry.path, rel_path
+
+def add_file(archive, src_file, arcname, compressed=None):
+    """
+    Writes a file from the source directory straight into the archive under `arcname`.
+    `compressed` is an optional `compress_file` result produced by a worker process.
+    """
+    if isinstance(archive, tarfile.TarFile):
+        archive.add(src_file, arcname=arcname, recursive=False)
+    elif compressed is not None:
+        write_precompressed(archive, src_file, arcname, *compressed)
     else:
-        logging.error("❌ The ZIP file has been altered or is corrupted!")
+        write_buffered(archive, src_file, arcname)
+    logging.debug('File added: %s', src_file)
 
-def remove_readonly(func, path, exc_info):
+def new_hasher(algorithm='sha256'):
     """
-    This function removes the readonly attribute of a file, allowing its deletion.
-    For Unix, it changes permissions to 777; for Windows, it removes the read-only flag.
+    Returns a new hash object for one of the algorithms in `CHECKSUM_NAMES`.
+    BLAKE3 is created multi-threaded; XXH3 is a fast non-cryptographic 128-bit checksum.
     """
-    if func == os.remove or func == os.rmdir:
-        if os.name == 'nt':  # Windows
-            # Remove readonly attribute (if any)
-            os.chmod(path, stat.S_IWRITE)
-        else:  # Unix-based systems
-            # Change file mode to ensure it's writable and deletable
-            os.chmod(path, 0o777)
-    func(path)
+    if algorithm == 'blake3':
+        return blake3(max_threads=blake3.AUTO)
+    if algorithm == 'xxh3':
+        return xxhash.xxh3_128()
+    return hashlib.sha256()
 
-def copy_and_zip(src, dest, verify=False, comment=None):
+def calculate_checksum(file, algorithm='sha256'):
     """
-    Copies files from the source directory to a temporary directory, compresses them into a ZIP file,
-    and optionally verifies the integrity of the ZIP file by checking its SHA-256 hash.
+    Calculates the checksum of a file for integrity verification.
+    BLAKE3 hashes a memory map of the file in parallel; the other algorithms hash a read-only
+    memory map in a single `update` call. When the file cannot be mapped (empty files, or files
+    over 2 GiB on Windows), SHA-256 uses `hashlib.file_digest` when available (Python 3.11+)
+    and otherwise the file is read in 1 MiB chunks into a reusable buffer.
+    """
+    if algorithm == 'blake3':
+        hasher = new_hasher(algorithm)
+        hasher.update_mmap(file)
+        return hasher.hexdigest()
+
+    with open(file, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size and not (os.name == 'nt' and size > MMAP_MAX_SIZE_WINDOWS):
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mapped, 'madvise'):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    hasher = new_hasher(algorithm)
+                    hasher.update(mapped)
+                    return hasher.hexdigest()
+            except (OSError, ValueError) as e:
+                logging.debug(f"Cannot memory-map {file}, hashing it in chunks: {e}")
+
+        if algorithm == 'sha256' and hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+
+        hasher = new_hasher(algorithm)
+        buffer = bytearray(HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            hasher.update(view[:size])
+    return hasher.hexdigest()
+
+def verify_integrity(zip_path, original_hash, algorithm='sha256'):
+    """
+    Verifies the integrity of the archive by comparing its calculated checksum
+    with the original hash stored during the backup process.
+    """
+    calculated_hash = calculate_checksum(zip_path, algorithm)
+    if calculated_hash == original_hash:
+        logging.info("✅ The archive is valid and has not been modified.")
+    else:
+        logging.error("❌ The archive has been altered or is corrupted!")
+
+def copy_and_zip(src, dest, verify=False, comment=None, compressor='deflate', level=None, workers=None,
+                 checksum='sha256'):
+    """
+    Compresses the files of the source directory into a ZIP file (or a `.tar.zst` archive when
+    `compressor` is `zstd`), streaming each file directly into the archive, and optionally
+    verifies the integrity of the archive by checking its `checksum` hash (SHA-256 by default).
+    With `deflate`, files are compressed in parallel by `workers` processes (default: one per CPU).
     """
-    global files_copied, files_ignored
     start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+    checksum_name = CHECKSUM_NAMES[checksum]
 
     setup_logger()
 
@@ -146,66 +596,54 @@ def copy_and_zip(src, dest, verify=False, comment=None):
     
     timestamp = datetime.now().strftime('%Y.%m.%d-%H.%M.%S')  # Updated format for timestamp
     folder_name = src.name  # Get the name of the source folder
-    zip_name = f'{timestamp} - {folder_name}.zip'  # Combine timestamp and folder name for ZIP file name
+    zip_name = f'{timestamp} - {folder_name}{ARCHIVE_EXTENSIONS[compressor]}'  # Combine timestamp and folder name for the archive name
 
-    # Create a folder with the same name as the ZIP file (without the .zip extension)
+    # Create a folder with the same name as the archive (without its extension)
     backup_folder = dest / f'{timestamp} - {folder_name}'
     logging.debug(f"Creating backup folder: {backup_folder}")
     backup_folder.mkdir(parents=True, exist_ok=True)
 
     zip_path = backup_folder / zip_name
     readme_path = backup_folder / 'readme.txt'
-    temp_dir = backup_folder / f'temp_backup_{timestamp}'
     
     gitignore_path = src / '.gitignore'
-    ignore_patterns = load_gitignore_patterns(gitignore_path, src)
-
-    files_to_copy = []
-    for root, dirs, files in os.walk(src):
-        root_path = Path(root)
-
-        # Skip copying files and directories inside `.git`
-        if ".git" in dirs:
-            dirs.remove(".git")
+    ignore_patterns = load_gitignore_patterns(gitignore_path)
 
-        dirs[:] = [d for d in dirs if not should_ignore(root_path / d, ignore_patterns, src)]
+    stats = {'ignored': 0}
+    files_to_copy = iter_files(src, ignore_patterns, stats, exclude=str(zip_path))
 
-        for file in files:
-            file_path = root_path / file
-            if should_ignore(file_path, ignore_patterns, src):
-                logging.warning(f'Ignored: {file_path}')
-                files_ignored += 1
-                continue
-            files_to_copy.append(file_path)
+    # Hash the archive while it is being written to avoid re-reading it from disk
+    writer = HashingWriter(open(zip_path, 'wb'), checksum)
+    try:
+        with open_archive(writer, compressor, level) as archive:
+            if compressor == 'deflate' and workers > 1:
+                entries = compress_in_workers(files_to_copy, level, workers)
+            else:
+                entries = ((file, arcname, None) for file, arcname in files_to_copy)
 
-    logging.debug(f"Total files to copy: {len(files_to_copy)}")
+            files_copied = 0
+            for file, arcname, compressed in tqdm(entries, desc="Compressing files", unit=' files'):
+                add_file(archive, file, arcname, compressed)
+                files_copied += 1
+    finally:
+        writer.close()
 
-    with ThreadPoolExecutor() as executor:
-        list(tqdm(executor.map(lambda f: copy_file(f, temp_dir, src), files_to_copy),
-                  total=len(files_to_copy), desc="Copying files"))
-
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for file in tqdm(temp_dir.rglob('*'), total=len(files_to_copy), desc="Compressing files"):
-            zipf.write(file, file.relative_to(temp_dir))
-
-    shutil.rmtree(temp_dir, onerror=remove_readonly)
-
-    zip_hash = calculate_sha256(zip_path)
+    zip_hash = writer.hexdigest()
 
     with readme_path.open('w', encoding='utf-8') as readme:
         readme.write(f'Backup created on: {timestamp}\n')
-        readme.write(f'ZIP file created: {zip_name}\n')
-        readme.write(f'SHA-256 hash of the ZIP file: {zip_hash}\n')
+        readme.write(f'Archive created: {zip_name}\n')
+        readme.write(f'{checksum_name} hash of the archive: {zip_hash}\n')
         if comment:
             readme.write(f'Comment: {comment}\n')
 
     logging.info(f'Backup completed: {zip_path}')
     logging.info(f'Readme created at: {readme_path}')
-    logging.info(f'SHA-256 hash of the ZIP file: {zip_hash}')
+    logging.info(f'{checksum_name} hash of the archive: {zip_hash}')
 
     if verify:
-        logging.info("Verifying the integrity of the ZIP file...")
-        verify_integrity(zip_path, zip_hash)
+        logging.info("Verifying the integrity of the archive...")
+        verify_integrity(zip_path, zip_hash, checksum)
 
     end_time = time.time()
     total_time = end_time - start_time
@@ -214,21 +652,46 @@ def copy_and_zip(src, dest, verify=False, comment=None):
     logging.info(f"-------------------------------")
     logging.info(f"Time taken: {total_time:.2f} seconds")
     logging.info(f"Files copied: {files_copied}")
-    logging.info(f"Files ignored: {files_ignored}")
+    logging.info(f"Files ignored: {stats['ignored']}")
     logging.info(f"Source directory: {src}")
     logging.info(f"Destination directory: {dest}")
-    logging.info(f"Size of the ZIP file: {os.path.getsize(zip_path) / (1024 * 1024):.2f} MB")
+    logging.info(f"Size of the archive: {os.path.getsize(zip_path) / (1024 * 1024):.2f} MB")
 
     if verify:
-        logging.info(f"SHA-256 hash of the ZIP file: {zip_hash}")
+        logging.info(f"{checksum_name} hash of the archive: {zip_hash}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Backup a directory while respecting .gitignore')
     parser.add_argument('source', type=str, help='Source directory to copy')
-    parser.add_argument('destination', type=str, help='Destination directory to save the ZIP file')
-    parser.add_argument('--verify', action='store_true', help='Verify ZIP file integrity')
+    parser.add_argument('destination', type=str, help='Destination directory to save the archive')
+    parser.add_argument('--verify', action='store_true', help='Verify archive integrity')
     parser.add_argument('--comment', type=str, help='Add a comment or note about the content being processed')
+    parser.add_argument('--compressor', choices=ARCHIVE_EXTENSIONS.keys(), default='deflate',
+                        help='Compression method: deflate/store produce a ZIP, zstd produces a .tar.zst (default: deflate)')
+    parser.add_argument('--level', type=int,
+                        help='Compression level (0-9 for deflate, 1-22 for zstd; defaults to the library default)')
+    parser.add_argument('--checksum', choices=CHECKSUM_NAMES.keys(), default='sha256',
+                        help='Checksum algorithm used for the archive (default: sha256)')
+    parser.add_argument('--workers', type=int,
+                        help='Number of processes used to compress files with deflate (default: one per CPU)')
     
     args = parser.parse_args()
-    copy_and_zip(args.source, args.destination, verify=args.verify, comment=args.comment)
+
+    if args.compressor == 'zstd' and zstandard is None:
+        parser.error("--compressor zstd requires the 'zstandard' package (pip install zstandard)")
+    if args.checksum == 'blake3' and blake3 is None:
+        parser.error("--checksum blake3 requires the 'blake3' package (pip install blake3)")
+    if args.checksum == 'xxh3' and xxhash is None:
+        parser.error("--checksum xxh3 requires the 'xxhash' package (pip install xxhash)")
+    if args.level is not None:
+        if args.compressor == 'deflate' and not 0 <= args.level <= 9:
+            parser.error("--level must be between 0 and 9 for deflate")
+        if args.compressor == 'zstd' and not 1 <= args.level <= 22:
+            parser.error("--level must be between 1 and 22 for zstd")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    copy_and_zip(args.source, args.destination, verify=args.verify, comment=args.comment,
+                 compressor=args.compressor, level=args.level, workers=args.workers,
+                 checksum=args.checksum)
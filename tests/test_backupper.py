@@ -0,0 +1,154 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+import backupper
+
+
+class GitignorePatternsTest(unittest.TestCase):
+    """
+    Checks `.gitignore` matching against relative paths as produced by the directory walk.
+    """
+    def load(self, *lines):
+        with tempfile.TemporaryDirectory() as tmp:
+            gitignore_path = Path(tmp) / '.gitignore'
+            gitignore_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+            return backupper.load_gitignore_patterns(gitignore_path)
+
+    def ignored(self, patterns, rel_path):
+        return backupper.should_ignore(rel_path.replace('/', os.sep), patterns)
+
+    def test_name_pattern_matches_at_any_depth(self):
+        patterns = self.load('node_modules', '*.log')
+        self.assertTrue(self.ignored(patterns, 'node_modules'))
+        self.assertTrue(self.ignored(patterns, 'a/node_modules'))
+        self.assertTrue(self.ignored(patterns, 'a/b/debug.log'))
+        self.assertFalse(self.ignored(patterns, 'a/main.py'))
+
+    def test_leading_double_star_matches_top_level_too(self):
+        patterns = self.load('**/node_modules')
+        self.assertTrue(self.ignored(patterns, 'node_modules'))
+        self.assertTrue(self.ignored(patterns, 'a/node_modules'))
+        self.assertTrue(self.ignored(patterns, 'a/b/node_modules'))
+
+    def test_star_does_not_cross_directories(self):
+        patterns = self.load('docs/*.md')
+        self.assertTrue(self.ignored(patterns, 'docs/a.md'))
+        self.assertFalse(self.ignored(patterns, 'docs/a/b.md'))
+        self.assertFalse(self.ignored(patterns, 'other/docs/a.md'))
+
+    def test_double_star_in_path_crosses_directories(self):
+        patterns = self.load('a/**/b', 'build/**')
+        self.assertTrue(self.ignored(patterns, 'a/b'))
+        self.assertTrue(self.ignored(patterns, 'a/x/y/b'))
+        self.assertTrue(self.ignored(patterns, 'build/x/y.o'))
+
+    def test_anchored_patterns(self):
+        patterns = self.load('/build/', '# comment', '')
+        self.assertTrue(self.ignored(patterns, 'build'))
+        self.assertFalse(self.ignored(patterns, 'src/app.py'))
+
+    def test_malformed_brackets_do_not_crash(self):
+        patterns = self.load('[z-a]', '[!]a]x', 'a[[]b')
+        self.assertFalse(self.ignored(patterns, 'z'))
+        self.assertTrue(self.ignored(patterns, 'bx'))
+        self.assertFalse(self.ignored(patterns, ']x'))
+        self.assertTrue(self.ignored(patterns, 'a[b'))
+        self.assertFalse(self.ignored(patterns, 'ab'))
+
+    def test_bracket_expressions(self):
+        patterns = self.load('[!a-c].txt', 'file[0-9]')
+        self.assertTrue(self.ignored(patterns, 'd.txt'))
+        self.assertFalse(self.ignored(patterns, 'b.txt'))
+        self.assertTrue(self.ignored(patterns, 'sub/file7'))
+        self.assertFalse(self.ignored(patterns, 'filex'))
+
+    def test_case_insensitive_on_windows(self):
+        with mock.patch.object(backupper.os, 'name', 'nt'):
+            self.assertTrue(backupper.compile_patterns(['*.log']).match('KEEP.LOG'))
+        with mock.patch.object(backupper.os, 'name', 'posix'):
+            self.assertIsNone(backupper.compile_patterns(['*.log']).match('KEEP.LOG'))
+
+
+
+class ParallelDeflateTest(unittest.TestCase):
+    """
+    Checks that entries compressed in worker processes and stitched into the ZIP by
+    `write_precompressed` produce an archive that `zipfile` can read back.
+    """
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.files = {
+            'text.txt': b''.join(b'line %d\n' % i for i in range(5000)),
+            'sub/small.py': b'print("hello")\n',
+            'sub/empty.txt': b'',
+            'photo.jpg': os.urandom(4096),
+            'big.bin': os.urandom(64 * 1024),
+        }
+        for arcname, data in self.files.items():
+            path = self.tmp / 'src' / arcname
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def entries(self):
+        for arcname in self.files:
+            yield str(self.tmp / 'src' / arcname), arcname
+
+    def write_zip(self, entries, compressor='deflate'):
+        zip_path = self.tmp / 'backup.zip'
+        writer = backupper.HashingWriter(open(zip_path, 'wb'))
+        try:
+            with backupper.open_archive(writer, compressor) as archive:
+                for src_file, arcname, compressed in entries:
+                    backupper.add_file(archive, src_file, arcname, compressed)
+        finally:
+            writer.close()
+        self.assertEqual(writer.hexdigest(), backupper.calculate_checksum(zip_path))
+        return zip_path
+
+    def assert_valid_zip(self, zip_path):
+        with zipfile.ZipFile(zip_path) as zipf:
+            self.assertIsNone(zipf.testzip())
+            self.assertEqual(sorted(zipf.namelist()), sorted(self.files))
+            for arcname, data in self.files.items():
+                self.assertEqual(zipf.read(arcname), data)
+            self.assertEqual(zipf.getinfo('text.txt').compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(zipf.getinfo('photo.jpg').compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zipf.getinfo('sub/empty.txt').compress_type, zipfile.ZIP_STORED)
+
+    def test_stored_entries_have_no_data_descriptor(self):
+        for compressor in ('deflate', 'store'):
+            with self.subTest(compressor=compressor):
+                zip_path = self.write_zip(
+                    ((src_file, arcname, None) for src_file, arcname in self.entries()), compressor)
+                with zipfile.ZipFile(zip_path) as zipf:
+                    self.assertIsNone(zipf.testzip())
+                    stored = [zinfo for zinfo in zipf.infolist() if zinfo.compress_type == zipfile.ZIP_STORED]
+                    self.assertTrue(stored)
+                    if compressor == 'store':
+                        self.assertEqual(len(stored), len(self.files))
+                    for zinfo in stored:
+                        self.assertEqual(zinfo.flag_bits & 0x08, 0, zinfo.filename)
+                        self.assertEqual(zipf.read(zinfo), self.files[zinfo.filename])
+
+    def test_write_precompressed(self):
+        entries = ((src_file, arcname, backupper.compress_file(src_file) if self.files[arcname] and arcname != 'photo.jpg' else None)
+                   for src_file, arcname in self.entries())
+        self.assert_valid_zip(self.write_zip(entries))
+
+    def test_compress_in_workers(self):
+        # Force one file through the serial path and several small batches through the pool
+        with mock.patch.object(backupper, 'PARALLEL_MAX_FILE_SIZE', 32 * 1024), \
+                mock.patch.object(backupper, 'PARALLEL_BATCH_FILES', 2):
+            self.assert_valid_zip(self.write_zip(backupper.compress_in_workers(self.entries(), workers=2)))
+
+
+if __name__ == '__main__':
+    unittest.main()